@@ -1,4 +1,10 @@
-from .engine import calculate_true_wealth, calculate_truth, determine_federal_rate, determine_tax_classification
+from .engine import (
+    calculate_true_wealth,
+    calculate_truth,
+    calculate_truth_batch,
+    determine_federal_rate,
+    determine_tax_classification,
+)
 from .models import PositionInput, TruthResult
 
 __all__ = [
@@ -6,6 +12,7 @@ __all__ = [
     "TruthResult",
     "calculate_truth",
     "calculate_true_wealth",
+    "calculate_truth_batch",
     "determine_tax_classification",
     "determine_federal_rate",
 ]
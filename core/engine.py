@@ -1,26 +1,47 @@
 """Pure computation engine for the Thrive Truth core domain."""
 
-from typing import List, Optional, Tuple
+import sys
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
 from .models import PositionInput, TruthResult
 
+if TYPE_CHECKING:  # pragma: no cover - optional dependency
+    import numpy as np
+
+_BASE_ASSUMPTIONS: Tuple[str, ...] = tuple(
+    sys.intern(note)
+    for note in (
+        "Federal long-term capital gains rate assumed at 15%.",
+        "Federal short-term capital gains rate assumed at 25%.",
+        "Taxes applied only on gains; losses generate no immediate tax bill.",
+        "No trading fees, spreads, or liquidity slippage included.",
+    )
+)
+
+_LONG_TERM_DAYS = 365
+
+# Indexed by int(days_held > _LONG_TERM_DAYS).
+_RATES: Tuple[float, float] = (0.25, 0.15)
+_LABELS: Tuple[str, str] = (sys.intern("short_term"), sys.intern("long_term"))
+
 
 def determine_tax_classification(days_held: int) -> str:
     """Return tax classification label based on holding period."""
 
-    return "long_term" if days_held > 365 else "short_term"
+    return _LABELS[days_held > _LONG_TERM_DAYS]
 
 
 def determine_federal_rate(tax_classification: str) -> float:
     """Return the assumed federal capital gains rate for the classification."""
 
-    return 0.15 if tax_classification == "long_term" else 0.25
+    return _RATES[tax_classification == "long_term"]
 
 
 def _validate_position(position: PositionInput) -> None:
     """Basic validation to keep calculations deterministic."""
 
-    if position.asset_type.lower() not in {"stock", "crypto"}:
+    if position.asset_type not in {"stock", "crypto"}:
         raise ValueError("asset_type must be 'stock' or 'crypto'.")
     if position.quantity < 0:
         raise ValueError("quantity must be non-negative.")
@@ -30,41 +51,42 @@ def _validate_position(position: PositionInput) -> None:
         raise ValueError("days_held cannot be negative.")
 
 
-def _assess_confidence(
-    position: PositionInput, state_rate: Optional[float]
-) -> Tuple[str, List[str]]:
-    """Assign a qualitative confidence level and supporting notes."""
+_STATE_NOTE = "State tax rate missing; result excludes state-level obligations."
+_CRYPTO_NOTE = "Crypto taxation varies; using generalized capital gains assumptions."
+_ZERO_NOTE = "Zero quantity or price reduces certainty of liquidation math."
 
-    score = 4
-    notes: List[str] = []
+# Indexed by (missing_state << 2) | (is_crypto << 1) | zero_quantity_or_price.
+# One deduction still rates HIGH, two rate MEDIUM, and any zero forces LOW.
+_CONFIDENCE_TABLE: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("HIGH", ()),
+    ("LOW", (_ZERO_NOTE,)),
+    ("HIGH", (_CRYPTO_NOTE,)),
+    ("LOW", (_CRYPTO_NOTE, _ZERO_NOTE)),
+    ("HIGH", (_STATE_NOTE,)),
+    ("LOW", (_STATE_NOTE, _ZERO_NOTE)),
+    ("MEDIUM", (_STATE_NOTE, _CRYPTO_NOTE)),
+    ("LOW", (_STATE_NOTE, _CRYPTO_NOTE, _ZERO_NOTE)),
+)
 
-    if state_rate is None:
-        score -= 1
-        notes.append(
-            "State tax rate missing; result excludes state-level obligations."
-        )
 
-    if position.asset_type.lower() == "crypto":
-        score -= 1
-        notes.append(
-            "Crypto taxation varies; using generalized capital gains assumptions."
-        )
+def _assess_confidence(
+    position: PositionInput, state_rate: Optional[float]
+) -> Tuple[str, Tuple[str, ...]]:
+    """Assign a qualitative confidence level and supporting notes."""
 
-    if position.quantity == 0 or position.current_price == 0:
-        score -= 1
-        notes.append("Zero quantity or price reduces certainty of liquidation math.")
+    key = (
+        (state_rate is None) << 2
+        | (position.asset_type == "crypto") << 1
+        | (position.quantity == 0 or position.current_price == 0)
+    )
+    return _CONFIDENCE_TABLE[key]
 
-    if score >= 3:
-        level = "HIGH"
-    elif score == 2:
-        level = "MEDIUM"
-    else:
-        level = "LOW"
 
-    if position.quantity == 0 or position.current_price == 0:
-        level = "LOW"
+@lru_cache(maxsize=64)
+def _state_rate_note(state_rate: float) -> str:
+    """Format the state tax assumption; portfolios reuse a handful of rates."""
 
-    return level, notes
+    return f"State tax rate applied at {state_rate:.2%} on positive gains."
 
 
 def _tax_classification_countdown(days_held: int) -> Optional[int]:
@@ -85,8 +107,9 @@ def calculate_truth(position: PositionInput) -> TruthResult:
 
     gross_value = position.current_price * position.quantity
     total_gain = (position.current_price - position.cost_basis_per_unit) * position.quantity
-    tax_classification = determine_tax_classification(position.days_held)
-    federal_rate = determine_federal_rate(tax_classification)
+    is_long = int(position.days_held > _LONG_TERM_DAYS)
+    tax_classification = _LABELS[is_long]
+    federal_rate = _RATES[is_long]
     state_rate = position.state_tax_rate
 
     federal_tax = 0.0
@@ -94,12 +117,7 @@ def calculate_truth(position: PositionInput) -> TruthResult:
     total_tax = 0.0
     loss_offset_value: Optional[float] = None
 
-    assumptions = [
-        "Federal long-term capital gains rate assumed at 15%.",
-        "Federal short-term capital gains rate assumed at 25%.",
-        "Taxes applied only on gains; losses generate no immediate tax bill.",
-        "No trading fees, spreads, or liquidity slippage included.",
-    ]
+    assumptions: List[str] = list(_BASE_ASSUMPTIONS)
 
     if state_rate is None:
         assumptions.append(
@@ -107,22 +125,20 @@ def calculate_truth(position: PositionInput) -> TruthResult:
         )
     else:
         # Normalize state_rate to float
-        if state_rate is not None:
-            if isinstance(state_rate, str):
-                s = state_rate.strip()
-                if s.endswith("%"):
-                    state_rate = float(s.rstrip("%")) / 100.0
-                else:
-                    state_rate = float(s)
+        if isinstance(state_rate, str):
+            s = state_rate.strip()
+            if s.endswith("%"):
+                state_rate = float(s.rstrip("%")) / 100.0
+            else:
+                state_rate = float(s)
 
-        assumptions.append(f"State tax rate applied at {state_rate:.2%} on positive gains.")
+        assumptions.append(_state_rate_note(state_rate))
 
     if total_gain > 0:
         federal_tax = total_gain * federal_rate
         state_tax = total_gain * state_rate if state_rate is not None else 0.0
         total_tax = federal_tax + state_tax
     else:
-        total_tax = 0.0
         marginal_rate = federal_rate + (state_rate or 0.0)
         loss_offset_value = abs(total_gain) * marginal_rate
         assumptions.append(
@@ -156,3 +172,64 @@ def calculate_truth(position: PositionInput) -> TruthResult:
 
 
 calculate_true_wealth = calculate_truth
+
+
+def calculate_truth_batch(
+    quantity: Sequence[float],
+    current_price: Sequence[float],
+    cost_basis_per_unit: Sequence[float],
+    days_held: Sequence[int],
+    state_tax_rate: Optional[Sequence[float]] = None,
+) -> Dict[str, "np.ndarray"]:
+    """Vectorized liquidation math over parallel position arrays.
+
+    Numeric outputs match ``calculate_truth`` position by position. Missing
+    state rates may be passed as NaN, or omit ``state_tax_rate`` entirely.
+    """
+
+    try:
+        import numpy as np
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise RuntimeError("NumPy is required for batch truth calculations.") from exc
+
+    qty = np.asarray(quantity, dtype=float)
+    price = np.asarray(current_price, dtype=float)
+    cost = np.asarray(cost_basis_per_unit, dtype=float)
+    days = np.asarray(days_held)
+    if state_tax_rate is None:
+        state_rate = np.zeros_like(qty)
+    else:
+        state_rate = np.nan_to_num(np.asarray(state_tax_rate, dtype=float))
+
+    # Reject mismatched lengths instead of letting NumPy broadcast them.
+    if not qty.shape == price.shape == cost.shape == days.shape == state_rate.shape:
+        raise ValueError("Position arrays must all have the same length.")
+    if (qty < 0).any():
+        raise ValueError("quantity must be non-negative.")
+    if (cost < 0).any() or (price < 0).any():
+        raise ValueError("Prices and cost basis must be non-negative.")
+    if (days < 0).any():
+        raise ValueError("days_held cannot be negative.")
+
+    gross_value = price * qty
+    total_gain = (price - cost) * qty
+    federal_rate = np.asarray(_RATES)[(days > _LONG_TERM_DAYS).astype(int)]
+    has_gain = total_gain > 0
+    federal_tax = np.where(has_gain, total_gain * federal_rate, 0.0)
+    state_tax = np.where(has_gain, total_gain * state_rate, 0.0)
+    total_tax = federal_tax + state_tax
+    net_liquid_wealth = gross_value - total_tax
+    with np.errstate(divide="ignore", invalid="ignore"):
+        efficiency_score = np.where(
+            gross_value > 0, net_liquid_wealth / gross_value * 100.0, 100.0
+        )
+
+    return {
+        "gross_value": gross_value,
+        "total_gain": total_gain,
+        "federal_tax": federal_tax,
+        "state_tax": state_tax,
+        "total_tax": total_tax,
+        "net_liquid_wealth": net_liquid_wealth,
+        "efficiency_score": efficiency_score,
+    }
@@ -17,8 +17,11 @@ class PositionInput:
     filing_status: str = "single"
     state_tax_rate: Optional[float] = None
 
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "asset_type", self.asset_type.lower())
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class TruthResult:
     """Deterministic calculation output for a single position."""
 
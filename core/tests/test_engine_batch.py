@@ -0,0 +1,62 @@
+"""Parity tests for the vectorized truth engine."""
+
+import unittest
+
+from core.engine import calculate_truth, calculate_truth_batch
+from core.models import PositionInput
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+_POSITIONS = (
+    PositionInput("stock", "LONG", 100.0, 10.0, 20.0, 400, state_tax_rate=0.05),
+    PositionInput("stock", "SHORT", 20.0, 50.0, 70.0, 200),
+    PositionInput("stock", "LOSS", 10.0, 100.0, 80.0, 500, state_tax_rate=0.05),
+    PositionInput("crypto", "ZERO", 0.0, 400.0, 450.0, 100),
+    PositionInput("crypto", "ETH", 2.0, 1000.0, 1500.0, 200, state_tax_rate=0.0),
+)
+
+
+@unittest.skipIf(np is None, "NumPy not available")
+class TruthEngineBatchTests(unittest.TestCase):
+    def test_batch_matches_scalar(self) -> None:
+        batch = calculate_truth_batch(
+            quantity=[p.quantity for p in _POSITIONS],
+            current_price=[p.current_price for p in _POSITIONS],
+            cost_basis_per_unit=[p.cost_basis_per_unit for p in _POSITIONS],
+            days_held=[p.days_held for p in _POSITIONS],
+            state_tax_rate=[
+                float("nan") if p.state_tax_rate is None else p.state_tax_rate
+                for p in _POSITIONS
+            ],
+        )
+
+        for index, position in enumerate(_POSITIONS):
+            expected = calculate_truth(position)
+            for field, values in batch.items():
+                with self.subTest(ticker=position.ticker, field=field):
+                    self.assertAlmostEqual(values[index], getattr(expected, field))
+
+    def test_missing_state_rates_default_to_zero(self) -> None:
+        batch = calculate_truth_batch([1.0], [15.0], [10.0], [100])
+        self.assertAlmostEqual(batch["state_tax"][0], 0.0)
+        self.assertAlmostEqual(batch["federal_tax"][0], 1.25)
+
+    def test_invalid_inputs_fail_loudly(self) -> None:
+        with self.assertRaises(ValueError):
+            calculate_truth_batch([-1.0], [10.0], [10.0], [1])
+        with self.assertRaises(ValueError):
+            calculate_truth_batch([1.0], [10.0], [10.0], [-1])
+
+    def test_mismatched_lengths_are_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            calculate_truth_batch([1.0, 2.0], [10.0, 10.0], [5.0, 5.0], [1, 1], [0.05])
+        with self.assertRaises(ValueError):
+            calculate_truth_batch([1.0, 2.0], [10.0], [5.0, 5.0], [1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,9 +9,10 @@ import os
 import shutil
 import subprocess
 import sys
-from dataclasses import asdict
+from dataclasses import fields
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Iterable, List, Optional, Tuple
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
 
 from execution_adapter.ethereum.adapter import AdapterError, plan_to_payloads
 from execution_adapter.ethereum.simulator import SimulationError, simulate
@@ -35,7 +36,7 @@ from execution_engine.models import (
 from execution_engine.planner import PlanValidationError, UnimplementedIntentError, validate_plan
 from execution_engine.planner import ExecutionPlanner
 from wallet_core.keystore import FileKeyStore
-from wallet_core.models import DerivationPath, WalletRecord
+from wallet_core.models import Account, DerivationPath, WalletRecord
 from wallet_core.signer import PassphraseEncryptor, WalletCore
 
 try:
@@ -46,15 +47,40 @@ except ImportError:  # pragma: no cover - optional dependency
     colorama_init = None
 
 _PROOF_MESSAGE = "WALLET PROOF CHECK"
+_PLANNER = ExecutionPlanner()
+_ACTIONS = {action.value: action for action in ActionType}
+_ACTIONS.update({value.lower(): action for value, action in list(_ACTIONS.items())})
+# Errors reported as "ERROR: ..." with exit code 2 instead of a traceback.
+_HANDLED_ERRORS = (
+    ValueError,
+    ExecutionBlockedError,
+    PolicyViolationError,
+    ModeTransitionError,
+    PlanValidationError,
+    UnimplementedIntentError,
+    AdapterError,
+    SimulationError,
+)
 _MEMORY_KEYSTORES: dict[str, dict[str, WalletRecord]] = {}
 _ACTIVE_ACCOUNTS: dict[str, dict[str, str]] = {}
+# Parsed active-account files, keyed by keystore path and validated by (mtime_ns, size).
+_ACTIVE_FILE_CACHE: dict[str, Tuple[Tuple[int, int], dict[str, str]]] = {}
 _COLOR_READY = False
-_COLOR_DISABLED = os.environ.get("NO_COLOR") is not None
 
 if colorama_init:
     colorama_init()
     _COLOR_READY = True
 
+_COLOR_ENABLED = _COLOR_READY and "NO_COLOR" not in os.environ
+
+
+def refresh_color() -> bool:
+    """Re-read ``NO_COLOR`` after the environment changes."""
+
+    global _COLOR_ENABLED
+    _COLOR_ENABLED = _COLOR_READY and "NO_COLOR" not in os.environ
+    return _COLOR_ENABLED
+
 
 def main(argv: Optional[List[str]] = None) -> int:
     if argv is None:
@@ -62,6 +88,16 @@ def main(argv: Optional[List[str]] = None) -> int:
     if not argv:
         return _dashboard()
 
+    args = _PARSER.parse_args(argv)
+
+    try:
+        return args.func(args)
+    except _HANDLED_ERRORS as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 2
+
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="capital-os")
     subparsers = parser.add_subparsers(dest="command", required=True)
 
@@ -195,22 +231,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     execute_parser.add_argument("--allowed-asset", action="append")
     execute_parser.set_defaults(func=_execute_plan)
 
-    args = parser.parse_args(argv)
-
-    try:
-        return args.func(args)
-    except (
-        ValueError,
-        ExecutionBlockedError,
-        PolicyViolationError,
-        ModeTransitionError,
-        PlanValidationError,
-        UnimplementedIntentError,
-        AdapterError,
-        SimulationError,
-    ) as exc:
-        print(f"ERROR: {exc}", file=sys.stderr)
-        return 2
+    return parser
 
 
 def _wallet_init(args: argparse.Namespace) -> int:
@@ -223,6 +244,7 @@ def _wallet_init(args: argparse.Namespace) -> int:
         "default",
         DerivationPath().to_string(),
     )
+    _compact_keystore(args.keystore)
     _set_active_account(args.keystore, metadata.wallet_id, account.account_id)
     print(metadata.wallet_id)
     return 0
@@ -332,6 +354,8 @@ def _wallet_seed(args: argparse.Namespace) -> int:
 
 
 def _wallet_backup(args: argparse.Namespace) -> int:
+    # Fold any journaled accounts in so the keystore file alone is a full backup.
+    _compact_keystore(args.keystore)
     _print_header("Wallet Backup")
     _print_copy_block("Keystore Path", args.keystore)
     active_path = _active_accounts_path(args.keystore)
@@ -344,6 +368,7 @@ def _account_new(args: argparse.Namespace) -> int:
     wallet = WalletCore(keystore=keystore, encryptor=PassphraseEncryptor())
     path = args.derivation_path or DerivationPath().to_string()
     account = wallet.add_account(args.wallet_id, args.label, path)
+    _compact_keystore(args.keystore)
     _set_active_account(args.keystore, args.wallet_id, account.account_id)
     _print_header("Account Created")
     _print_key_value("Account", account.account_id)
@@ -366,8 +391,7 @@ def _state_show(args: argparse.Namespace) -> int:
 def _plan_create(args: argparse.Namespace) -> int:
     intent = _build_intent(args)
     capital_state = _build_capital_state(args)
-    planner = ExecutionPlanner()
-    plan = planner.plan(intent, capital_state)
+    plan = _PLANNER.plan(intent, capital_state)
     print(json.dumps(_plan_to_dict(plan), indent=2))
     return 0
 
@@ -378,15 +402,15 @@ def _simulate_plan(args: argparse.Namespace) -> int:
     dry_run = simulate(payloads)
     if args.json:
         output = {
-            "payloads": [asdict(payload) for payload in payloads],
-            "dry_run": asdict(dry_run),
+            "payloads": [_to_plain(payload) for payload in payloads],
+            "dry_run": _to_plain(dry_run),
         }
         print(json.dumps(output, indent=2))
     else:
         _print_header("Ethereum Simulation")
         _print_key_value("Transactions", str(len(payloads)))
         for payload in payloads:
-            payload_text = json.dumps(asdict(payload), indent=2)
+            payload_text = json.dumps(_to_plain(payload), indent=2)
             _print_copy_block("Tx Payload", payload_text)
         _print_key_value("Dry Run Success", str(dry_run.success))
         _print_key_value("Total Gas Used", str(dry_run.total_gas_used))
@@ -397,38 +421,58 @@ def _simulate_plan(args: argparse.Namespace) -> int:
 
 
 def _execute_plan(args: argparse.Namespace) -> int:
-    plan = _load_plan(args.plan)
+    output = execute_plan(
+        _read_plan_data(args.plan),
+        mode=args.mode,
+        arm=args.arm,
+        yes=args.yes,
+        allowed_actions=args.allowed_action,
+        allowed_assets=args.allowed_asset,
+    )
+    print(json.dumps(output, indent=2))
+    return 0
+
+
+def execute_plan(
+    plan_data: dict,
+    mode: str,
+    arm: bool,
+    yes: bool,
+    allowed_actions: Optional[Sequence[str]] = None,
+    allowed_assets: Optional[Sequence[str]] = None,
+) -> dict:
+    """Run a serialized plan through the execution controller in-process.
+
+    This is the body of the ``execute`` subcommand without stdin/file
+    loading or JSON output; it returns the same payload the CLI prints.
+    """
+
+    plan = _plan_from_data(plan_data)
 
     controller = ExecutionController()
-    if args.mode == "manual":
+    if mode == "manual":
         controller.set_mode(ExecutionMode.MANUAL)
     else:
-        policy = _build_policy(args)
+        policy = _build_policy(allowed_actions, allowed_assets)
         controller.set_mode(ExecutionMode.GUARDED, policy=policy)
 
-    if not args.arm:
+    if not arm:
         raise ExecutionBlockedError("Execution must be armed explicitly.")
     controller.arm()
 
-    if not args.yes:
+    if not yes:
         if not _confirm("Confirm execution? [y/N]: "):
             raise ExecutionBlockedError("Execution confirmation denied.")
 
     confirm_step = None
-    if args.mode == "manual":
-        confirm_step = _confirm_step if args.yes else _prompt_step
+    if mode == "manual":
+        confirm_step = _confirm_step if yes else _prompt_step
 
     decisions = controller.evaluate_plan(plan, confirm_step=confirm_step)
-    print(
-        json.dumps(
-            {
-                "mode": args.mode,
-                "decisions": [asdict(decision) for decision in decisions],
-            },
-            indent=2,
-        )
-    )
-    return 0
+    return {
+        "mode": mode,
+        "decisions": [_to_plain(decision) for decision in decisions],
+    }
 
 
 def _status(args: argparse.Namespace) -> int:
@@ -554,23 +598,50 @@ def _parse_exposures(values: Iterable[str]) -> Tuple[CapitalExposure, ...]:
 
 
 def _parse_action(value: str) -> ActionType:
-    normalized = value.strip().upper()
-    for action in ActionType:
-        if action.value == normalized:
-            return action
-    raise ValueError(f"Unsupported action type: {value}")
+    # Serialized plans and typed flags hit the table as-is; only odd input is normalized.
+    action = _ACTIONS.get(value)
+    if action is None:
+        action = _ACTIONS.get(value.strip().upper())
+    if action is None:
+        raise ValueError(f"Unsupported action type: {value}")
+    return action
 
 
 def _load_plan(plan_source: str) -> ExecutionPlan:
+    return _plan_from_data(_read_plan_data(plan_source))
+
+
+def _read_plan_data(plan_source: str) -> dict:
     if plan_source == "-":
-        payload = json.loads(sys.stdin.read())
-    else:
-        payload = json.loads(Path(plan_source).read_text())
-    plan = _plan_from_dict(payload)
+        return json.loads(sys.stdin.read())
+    return json.loads(Path(plan_source).read_text())
+
+
+def _plan_from_data(data: dict) -> ExecutionPlan:
+    plan = _plan_from_dict(data)
     validate_plan(plan)
     return plan
 
 
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    return tuple(field.name for field in fields(cls))
+
+
+def _to_plain(obj: object) -> dict:
+    """``dataclasses.asdict`` equivalent with field names resolved once per class."""
+
+    return {name: _plain_value(getattr(obj, name)) for name in _field_names(type(obj))}
+
+
+def _plain_value(value: object) -> object:
+    if hasattr(type(value), "__dataclass_fields__"):
+        return _to_plain(value)
+    if isinstance(value, (tuple, list)):
+        return type(value)(_plain_value(item) for item in value)
+    return value
+
+
 def _plan_to_dict(plan: ExecutionPlan) -> dict:
     return {
         "intent": {
@@ -666,11 +737,14 @@ def _plan_from_dict(data: dict) -> ExecutionPlan:
     )
 
 
-def _build_policy(args: argparse.Namespace) -> GuardPolicy:
-    if not args.allowed_action:
+def _build_policy(
+    allowed_actions: Optional[Sequence[str]],
+    allowed_assets: Optional[Sequence[str]],
+) -> GuardPolicy:
+    if not allowed_actions:
         raise PolicyViolationError("Guarded mode requires allowed actions.")
-    actions = tuple(_parse_action(action) for action in args.allowed_action)
-    assets = tuple(args.allowed_asset) if args.allowed_asset else None
+    actions = tuple(_parse_action(action) for action in allowed_actions)
+    assets = tuple(allowed_assets) if allowed_assets else None
     return GuardPolicy(allowed_action_types=actions, allowed_assets=assets)
 
 
@@ -694,7 +768,21 @@ def _get_keystore(path_value: str):
     if path_value.startswith("mem://"):
         store = _MEMORY_KEYSTORES.setdefault(path_value, {})
         return _InMemoryKeyStore(store)
-    return FileKeyStore(Path(path_value))
+    return _file_keystore(path_value)
+
+
+@lru_cache(maxsize=64)
+def _file_keystore(path_value: str) -> FileKeyStore:
+    # One instance per path so its mtime-validated record cache survives
+    # across commands run in the same process (e.g. the dashboard loop).
+    return FileKeyStore(Path(path_value), fsync=True)
+
+
+def _compact_keystore(path_value: str) -> None:
+    # Each CLI command is one-shot; leave keystore.json self-contained rather
+    # than holding accounts in the journal until the compaction threshold.
+    if not path_value.startswith("mem://"):
+        _file_keystore(path_value).compact()
 
 
 def _select_account_info(
@@ -759,14 +847,26 @@ class _InMemoryKeyStore:
     def list_metadata(self) -> Tuple:
         return tuple(record.metadata for record in self._store.values())
 
+    def append_account(self, wallet_id: str, account: Account) -> None:
+        self._store[wallet_id] = self.load(wallet_id).with_account(account)
+
 
 def _active_account_store(path_value: str) -> dict[str, str]:
     if path_value.startswith("mem://"):
         return _ACTIVE_ACCOUNTS.setdefault(path_value, {})
     path = _active_accounts_path(path_value)
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        _ACTIVE_FILE_CACHE.pop(path_value, None)
         return {}
-    return json.loads(path.read_text()).get("wallets", {})
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _ACTIVE_FILE_CACHE.get(path_value)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    wallets = json.loads(path.read_text()).get("wallets", {})
+    _ACTIVE_FILE_CACHE[path_value] = (stamp, wallets)
+    return wallets
 
 
 def _set_active_account(path_value: str, wallet_id: str, account_id: str) -> None:
@@ -774,9 +874,14 @@ def _set_active_account(path_value: str, wallet_id: str, account_id: str) -> Non
         _ACTIVE_ACCOUNTS.setdefault(path_value, {})[wallet_id] = account_id
         return
     path = _active_accounts_path(path_value)
-    payload = {"wallets": _active_account_store(path_value)}
-    payload["wallets"][wallet_id] = account_id
-    path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+    wallets = dict(_active_account_store(path_value))
+    wallets[wallet_id] = account_id
+    data = json.dumps({"wallets": wallets}, separators=(",", ":"), sort_keys=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(data)
+    os.replace(tmp_path, path)
+    stat = path.stat()
+    _ACTIVE_FILE_CACHE[path_value] = ((stat.st_mtime_ns, stat.st_size), wallets)
 
 
 def _get_active_account(path_value: str, wallet_id: str) -> Optional[str]:
@@ -788,11 +893,8 @@ def _active_accounts_path(path_value: str) -> Path:
 
 
 def _supports_color() -> bool:
-    if os.environ.get("NO_COLOR") is not None:
-        return False
-    if not _COLOR_READY:
-        return False
-    return sys.stdout.isatty()
+    # stdout is swapped out under redirection, so the tty probe stays live.
+    return _COLOR_ENABLED and sys.stdout.isatty()
 
 
 def _colorize(text: str, tone: str, bright: bool = False) -> str:
@@ -1208,5 +1310,8 @@ def _print_status(output: dict) -> None:
         _print_key_value("Last Dry Run", summary)
 
 
+_PARSER = _build_parser()
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,13 @@
+"""JSON decoding for CLI test assertions, using orjson when installed."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+    loads = orjson.loads
+else:  # pragma: no cover - optional dependency
+    loads = json.loads
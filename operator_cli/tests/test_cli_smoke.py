@@ -1,20 +1,26 @@
 """Smoke tests for the operator CLI."""
 
-import json
 import sys
 import unittest
 from contextlib import contextmanager, redirect_stdout
+from dataclasses import asdict
 from io import StringIO
 
-from operator_cli.cli import main
+from execution_adapter.ethereum.models import DryRunResult, DryRunTxResult
+from operator_cli.cli import _to_plain, execute_plan, main
+from operator_cli.tests._jsonfast import loads
 
 
 class OperatorCliSmokeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._buf = StringIO()
+
     def _run(self, args):
-        buf = StringIO()
-        with redirect_stdout(buf):
+        self._buf.seek(0)
+        self._buf.truncate()
+        with redirect_stdout(self._buf):
             code = main(args)
-        return code, buf.getvalue()
+        return code, self._buf.getvalue()
 
     def test_plan_create_outputs_json(self) -> None:
         code, output = self._run(
@@ -38,7 +44,7 @@ class OperatorCliSmokeTests(unittest.TestCase):
             ]
         )
         self.assertEqual(code, 0)
-        payload = json.loads(output)
+        payload = loads(output)
         self.assertEqual(payload["intent"]["action_type"], "SWAP")
 
     def test_dashboard_runs_without_flags(self) -> None:
@@ -48,8 +54,8 @@ class OperatorCliSmokeTests(unittest.TestCase):
         self.assertEqual(code, 0)
         self.assertIn("Capital OS", output)
 
-    def test_execute_manual_yes(self) -> None:
-        plan_code, plan_output = self._run(
+    def _create_plan(self, snapshot_id: str) -> str:
+        code, output = self._run(
             [
                 "plan",
                 "create",
@@ -62,14 +68,34 @@ class OperatorCliSmokeTests(unittest.TestCase):
                 "--amount",
                 "1.0",
                 "--snapshot-id",
-                "snap-cli-002",
+                snapshot_id,
                 "--exposure",
                 "ETH=2.0",
                 "--exposure",
                 "USDC=1000.0",
             ]
         )
-        self.assertEqual(plan_code, 0)
+        self.assertEqual(code, 0)
+        return output
+
+    def test_execute_manual_yes(self) -> None:
+        plan_output = self._create_plan("snap-cli-002")
+        payload = execute_plan(loads(plan_output), mode="manual", arm=True, yes=True)
+        self.assertEqual(payload["mode"], "manual")
+        self.assertTrue(payload["decisions"])
+
+    def test_to_plain_matches_asdict(self) -> None:
+        dry_run = DryRunResult(
+            success=True,
+            tx_results=(DryRunTxResult(1, True, 21000, 10, notes=("ok",)),),
+            total_gas_used=21000,
+            total_cost_wei=10,
+            notes=("simulated",),
+        )
+        self.assertEqual(_to_plain(dry_run), asdict(dry_run))
+
+    def test_execute_reads_plan_from_stdin(self) -> None:
+        plan_output = self._create_plan("snap-cli-003")
         buf = StringIO(plan_output)
         with _redirect_stdin(buf):
             code, output = self._run(
@@ -84,7 +110,7 @@ class OperatorCliSmokeTests(unittest.TestCase):
                 ]
             )
         self.assertEqual(code, 0)
-        payload = json.loads(output)
+        payload = loads(output)
         self.assertEqual(payload["mode"], "manual")
         self.assertTrue(payload["decisions"])
 
@@ -1,13 +1,15 @@
 """Visibility tests for status and prove commands."""
 
-import copy
 import json
+import tempfile
 import unittest
 from contextlib import redirect_stderr, redirect_stdout
 from io import StringIO
+from pathlib import Path
 import os
 
 from operator_cli import cli
+from operator_cli.tests._jsonfast import loads
 
 
 class OperatorCliVisibilityTests(unittest.TestCase):
@@ -58,7 +60,7 @@ class OperatorCliVisibilityTests(unittest.TestCase):
             ]
         )
         self.assertEqual(code, 0)
-        payload = json.loads(output)
+        payload = loads(output)
         self.assertEqual(payload["wallet_state"], "UNLOCKED")
         self.assertEqual(payload["active_account"], "default")
         self.assertNotEqual(payload["active_address"], "LOCKED")
@@ -105,14 +107,17 @@ class OperatorCliVisibilityTests(unittest.TestCase):
             ]
         )
         self.assertEqual(code, 0)
-        payload = json.loads(output)
+        payload = loads(output)
         self.assertEqual(payload["verification"], "PASS")
         self.assertEqual(payload["account"], "default")
 
     def test_visibility_does_not_mutate_state(self) -> None:
         wallet_id = self._init_wallet()
-        store_before = copy.deepcopy(cli._MEMORY_KEYSTORES[self.keystore])
-        active_before = copy.deepcopy(cli._ACTIVE_ACCOUNTS[self.keystore])
+        store_before = {
+            key: record.to_dict()
+            for key, record in cli._MEMORY_KEYSTORES[self.keystore].items()
+        }
+        active_before = dict(cli._ACTIVE_ACCOUNTS[self.keystore])
 
         self._run(
             [
@@ -138,15 +143,13 @@ class OperatorCliVisibilityTests(unittest.TestCase):
                 "pass",
             ]
         )
-        store_after = cli._MEMORY_KEYSTORES[self.keystore]
+        store_after = {
+            key: record.to_dict()
+            for key, record in cli._MEMORY_KEYSTORES[self.keystore].items()
+        }
         active_after = cli._ACTIVE_ACCOUNTS[self.keystore]
 
-        self.assertEqual(store_before.keys(), store_after.keys())
-        for key in store_before:
-            self.assertEqual(
-                store_before[key].to_dict(),
-                store_after[key].to_dict(),
-            )
+        self.assertEqual(store_before, store_after)
         self.assertEqual(active_before, active_after)
 
     def test_active_account_set_on_init(self) -> None:
@@ -157,6 +160,7 @@ class OperatorCliVisibilityTests(unittest.TestCase):
         wallet_id = self._init_wallet()
         os.environ["NO_COLOR"] = "1"
         try:
+            cli.refresh_color()
             code, output, _ = self._run(
                 [
                     "status",
@@ -168,9 +172,46 @@ class OperatorCliVisibilityTests(unittest.TestCase):
             )
         finally:
             os.environ.pop("NO_COLOR", None)
+            cli.refresh_color()
         self.assertEqual(code, 0)
         self.assertIn("Capital OS Status", output)
 
+    def test_active_account_file_tracks_writes(self) -> None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            keystore = str(Path(tempdir) / "keystore.json")
+            self.assertIsNone(cli._get_active_account(keystore, "w1"))
+
+            cli._set_active_account(keystore, "w1", "acct-1")
+            self.assertEqual(cli._get_active_account(keystore, "w1"), "acct-1")
+            cli._set_active_account(keystore, "w2", "acct-2")
+            self.assertEqual(cli._get_active_account(keystore, "w1"), "acct-1")
+            self.assertEqual(cli._get_active_account(keystore, "w2"), "acct-2")
+
+            active_path = cli._active_accounts_path(keystore)
+            active_path.write_text(json.dumps({"wallets": {"w1": "external"}}, indent=2))
+            self.assertEqual(cli._get_active_account(keystore, "w1"), "external")
+
+    def test_wallet_init_leaves_keystore_self_contained(self) -> None:
+        with tempfile.TemporaryDirectory() as tempdir:
+            keystore = str(Path(tempdir) / "keystore.json")
+            code, _, _ = self._run(
+                [
+                    "wallet",
+                    "init",
+                    "--keystore",
+                    keystore,
+                    "--label",
+                    "primary",
+                    "--passphrase",
+                    "pass",
+                ]
+            )
+            self.assertEqual(code, 0)
+
+            self.assertFalse(cli._file_keystore(keystore).journal_path.exists())
+            records = json.loads(Path(keystore).read_text())
+            self.assertEqual(len(records[0]["accounts"]), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
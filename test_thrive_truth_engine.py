@@ -1,8 +1,16 @@
 """Unit tests for the Thrive Truth Engine using unittest and stdlib only."""
 
 import unittest
+from contextlib import redirect_stdout
+from io import StringIO
 
-from thrive.truth_engine import PositionInput, calculate_truth
+from core.engine import calculate_truth as calculate_truth_result
+from thrive.truth_engine import (
+    PositionInput,
+    _format_currency,
+    calculate_truth,
+    print_report,
+)
 
 
 class ThriveTruthEngineTests(unittest.TestCase):
@@ -164,6 +172,27 @@ class ThriveTruthEngineTests(unittest.TestCase):
             any("Crypto taxation varies" in note for note in result["assumptions"])
         )
 
+    def test_format_currency_keeps_negative_zero_sign(self) -> None:
+        self.assertEqual(_format_currency(0.0), "$0.00")
+        self.assertEqual(_format_currency(-0.0), "$-0.00")
+        self.assertEqual(_format_currency(0.0), "$0.00")
+        self.assertEqual(_format_currency(-1234.5), "$-1,234.50")
+
+    def test_print_report_accepts_dicts_with_extra_keys(self) -> None:
+        position = PositionInput("stock", "LOSS", 10.0, 100.0, 80.0, 500)
+        result = calculate_truth(position)
+        result["ticker"] = position.ticker
+
+        dict_out = StringIO()
+        with redirect_stdout(dict_out):
+            print_report(position, result)
+        result_out = StringIO()
+        with redirect_stdout(result_out):
+            print_report(position, calculate_truth_result(position))
+
+        self.assertEqual(dict_out.getvalue(), result_out.getvalue())
+        self.assertIn("Loss offset insight", dict_out.getvalue())
+
 
 if __name__ == "__main__":
     unittest.main()
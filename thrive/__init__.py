@@ -1,19 +1,33 @@
-from .truth_engine import (
-    PositionInput,
-    calculate_truth,
-    calculate_true_wealth,
-    print_report,
-    run_example,
-    determine_tax_classification,
-    determine_federal_rate,
-)
+import importlib
+
+_LAZY = {
+    'PositionInput': 'thrive.truth_engine',
+    'calculate_truth': 'thrive.truth_engine',
+    'calculate_true_wealth': 'thrive.truth_engine',
+    'calculate_truth_batch': 'thrive.truth_engine',
+    'print_report': 'thrive.truth_engine',
+    'run_example': 'thrive.truth_engine',
+    'determine_tax_classification': 'thrive.truth_engine',
+    'determine_federal_rate': 'thrive.truth_engine',
+}
 
 __all__ = [
     'PositionInput',
     'calculate_truth',
     'calculate_true_wealth',
+    'calculate_truth_batch',
     'print_report',
     'run_example',
     'determine_tax_classification',
     'determine_federal_rate',
 ]
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -6,11 +6,14 @@ This module calculates after-tax, real-world cash value and exposes a simple
 CLI for quick inspection without external dependencies.
 """
 
-from typing import Dict
+from functools import lru_cache, partial
+import math
+from typing import Dict, Union
 
 from core.engine import calculate_truth as _calculate_truth
+from core.engine import calculate_truth_batch
 from core.engine import determine_federal_rate, determine_tax_classification
-from core.models import PositionInput
+from core.models import PositionInput, TruthResult
 
 
 def calculate_truth(position: PositionInput) -> Dict[str, object]:
@@ -22,17 +25,28 @@ def calculate_truth(position: PositionInput) -> Dict[str, object]:
 calculate_true_wealth = calculate_truth
 
 
+@lru_cache(maxsize=4096)
+def _format_currency_cached(value: float, sign: float) -> str:
+    return f"${value:,.2f}"
+
+
 def _format_currency(value: float) -> str:
     """Format a float as currency for console output."""
 
-    return f"${value:,.2f}"
+    # -0.0 == 0.0 would share a cache slot; keying on the sign keeps "$-0.00".
+    return _format_currency_cached(value, math.copysign(1.0, value))
 
 
-def print_report(position: PositionInput, result: Dict[str, object]) -> None:
+def print_report(
+    position: PositionInput, result: Union[TruthResult, Dict[str, object]]
+) -> None:
     """Render a human-readable liquidation report."""
 
-    gain_label = "gain" if result["total_gain"] >= 0 else "loss"
-    tax_class = result["tax_classification"].replace("_", "-")
+    # Dicts are read in place, so callers may pass extra keys through.
+    field = result.get if isinstance(result, dict) else partial(getattr, result)
+
+    gain_label = "gain" if field("total_gain") >= 0 else "loss"
+    tax_class = field("tax_classification").replace("_", "-")
 
     print("Thrive Truth Engine - Liquidation Reality Check")
     print("=" * 60)
@@ -41,32 +55,32 @@ def print_report(position: PositionInput, result: Dict[str, object]) -> None:
     print(f"Current price: {_format_currency(position.current_price)}")
     print(f"Cost basis per unit: {_format_currency(position.cost_basis_per_unit)}")
     print()
-    print(f"Gross liquidation value: {_format_currency(result['gross_value'])}")
+    print(f"Gross liquidation value: {_format_currency(field('gross_value'))}")
     print(
-        f"Total {gain_label}: {_format_currency(result['total_gain'])} "
+        f"Total {gain_label}: {_format_currency(field('total_gain'))} "
         f"({tax_class})"
     )
-    print(f"Federal tax: {_format_currency(result['federal_tax'])}")
-    print(f"State tax: {_format_currency(result['state_tax'])}")
-    print(f"Total estimated tax: {_format_currency(result['total_tax'])}")
-    print(f"Net liquid wealth: {_format_currency(result['net_liquid_wealth'])}")
-    print(f"Efficiency score: {result['efficiency_score']:.2f}%")
-    print(f"Confidence: {result['confidence_level']}")
-
-    if "tax_classification_countdown" in result:
+    print(f"Federal tax: {_format_currency(field('federal_tax'))}")
+    print(f"State tax: {_format_currency(field('state_tax'))}")
+    print(f"Total estimated tax: {_format_currency(field('total_tax'))}")
+    print(f"Net liquid wealth: {_format_currency(field('net_liquid_wealth'))}")
+    print(f"Efficiency score: {field('efficiency_score'):.2f}%")
+    print(f"Confidence: {field('confidence_level')}")
+
+    if field("tax_classification_countdown") is not None:
         print(
             f"Timing note: Tax classification changes in "
-            f"{result['tax_classification_countdown']} days."
+            f"{field('tax_classification_countdown')} days."
         )
 
-    if "loss_offset_value" in result:
+    if field("loss_offset_value") is not None:
         print(
             f"Loss offset insight: Potential future tax offset worth "
-            f"{_format_currency(result['loss_offset_value'])}."
+            f"{_format_currency(field('loss_offset_value'))}."
         )
 
     print("\nAssumptions and caveats:")
-    for assumption in result["assumptions"]:
+    for assumption in field("assumptions"):
         print(f"- {assumption}")
 
 
@@ -84,7 +98,7 @@ def run_example() -> None:
         state_tax_rate=0.05,
     )
 
-    result = calculate_truth(example_position)
+    result = _calculate_truth(example_position)
     print_report(example_position, result)
 
 
@@ -1,11 +1,26 @@
-from .keystore import FileKeyStore, KeyStore
-from .models import Account, DerivationPath, EncryptedPayload, WalletMetadata, WalletRecord
-from .signer import PassphraseEncryptor, WalletCore, WalletStatus
+import importlib
+
+_LAZY = {
+    "Account": "wallet_core.models",
+    "CipherBackend": "wallet_core.models",
+    "DerivationPath": "wallet_core.models",
+    "EncryptedPayload": "wallet_core.models",
+    "EncryptedPayloadRaw": "wallet_core.models",
+    "FileKeyStore": "wallet_core.keystore",
+    "KeyStore": "wallet_core.keystore",
+    "PassphraseEncryptor": "wallet_core.signer",
+    "WalletCore": "wallet_core.signer",
+    "WalletMetadata": "wallet_core.models",
+    "WalletRecord": "wallet_core.models",
+    "WalletStatus": "wallet_core.signer",
+}
 
 __all__ = [
     "Account",
+    "CipherBackend",
     "DerivationPath",
     "EncryptedPayload",
+    "EncryptedPayloadRaw",
     "FileKeyStore",
     "KeyStore",
     "PassphraseEncryptor",
@@ -14,3 +29,13 @@ __all__ = [
     "WalletRecord",
     "WalletStatus",
 ]
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -1,10 +1,11 @@
 """Local keystore persistence for wallet records."""
 
 from pathlib import Path
-from typing import Iterable, Protocol, Tuple
+from typing import BinaryIO, Dict, Iterable, Optional, Protocol, Tuple
 import json
+import os
 
-from .models import WalletMetadata, WalletRecord
+from .models import Account, WalletMetadata, WalletRecord, _json_default
 
 
 class KeyStore(Protocol):
@@ -19,29 +20,135 @@ class KeyStore(Protocol):
 
 
 class FileKeyStore:
-    def __init__(self, path: Path) -> None:
+    """JSON keystore with an append-only account journal.
+
+    ``append_account`` writes one JSON line to ``<path>.journal`` instead of
+    rewriting the whole keystore; the journal is replayed on read and folded
+    back into the main file by ``store``/``compact`` or once it reaches
+    ``compact_every`` entries.
+    """
+
+    def __init__(self, path: Path, fsync: bool = False, compact_every: int = 64) -> None:
         self._path = path
+        self._journal_path = path.with_name(path.name + ".journal")
+        self._fsync = fsync
+        self._compact_every = compact_every
+        self._cache: Optional[Tuple[Tuple[int, ...], Dict[str, WalletRecord], int]] = None
+
+    @property
+    def journal_path(self) -> Path:
+        return self._journal_path
 
     def store(self, record: WalletRecord) -> None:
-        records = {item.metadata.wallet_id: item for item in self._read_all()}
+        records = dict(self._read_all())
         records[record.metadata.wallet_id] = record
         self._write_all(records.values())
 
     def load(self, wallet_id: str) -> WalletRecord:
-        for record in self._read_all():
-            if record.metadata.wallet_id == wallet_id:
-                return record
-        raise KeyError(f"Unknown wallet_id: {wallet_id}")
+        try:
+            return self._read_all()[wallet_id]
+        except KeyError:
+            raise KeyError(f"Unknown wallet_id: {wallet_id}") from None
 
     def list_metadata(self) -> Tuple[WalletMetadata, ...]:
-        return tuple(record.metadata for record in self._read_all())
+        return tuple(record.metadata for record in self._read_all().values())
+
+    def append_account(self, wallet_id: str, account: Account) -> None:
+        updated = self.load(wallet_id).with_account(account)
+        entry = {"wallet_id": wallet_id, "account": account}
+        line = json.dumps(entry, default=_json_default, separators=(",", ":")) + "\n"
+        with open(self._journal_path, "a+b") as handle:
+            _drop_torn_tail(handle)
+            handle.write(line.encode("utf-8"))
+            if self._fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        # Fold the new entry into the cache rather than re-parsing everything.
+        _, records, entries = self._cache
+        records[wallet_id] = updated
+        entries += 1
+        self._cache = (self._stamp(), records, entries)
+        if entries >= self._compact_every:
+            self.compact()
+
+    def compact(self) -> None:
+        """Fold journaled accounts into the main keystore file."""
+
+        if not self._journal_path.exists():
+            return
+        self._write_all(self._read_all().values())
 
-    def _read_all(self) -> Tuple[WalletRecord, ...]:
-        if not self._path.exists():
-            return ()
+    def _stamp(self) -> Tuple[int, ...]:
+        stat = self._path.stat()
+        try:
+            journal_stat = self._journal_path.stat()
+            journal_stamp = (journal_stat.st_mtime_ns, journal_stat.st_size)
+        except FileNotFoundError:
+            journal_stamp = (0, 0)
+        return (stat.st_mtime_ns, stat.st_size) + journal_stamp
+
+    def _read_all(self) -> Dict[str, WalletRecord]:
+        try:
+            stamp = self._stamp()
+        except FileNotFoundError:
+            self._cache = None
+            return {}
+        if self._cache is not None and self._cache[0] == stamp:
+            return self._cache[1]
         data = json.loads(self._path.read_text())
-        return tuple(WalletRecord.from_dict(item) for item in data)
+        records = {}
+        for item in data:
+            record = WalletRecord.from_dict(item)
+            records[record.metadata.wallet_id] = record
+        entries = self._replay_journal(records) if stamp[3] else 0
+        self._cache = (stamp, records, entries)
+        return records
+
+    def _replay_journal(self, records: Dict[str, WalletRecord]) -> int:
+        entries = 0
+        # Only newline-terminated lines are complete; an unterminated last
+        # line is a torn write and is dropped by the next append.
+        lines = self._journal_path.read_text().split("\n")[:-1]
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            entries += 1
+            record = records.get(entry["wallet_id"])
+            account = Account(**entry["account"])
+            # Entries may already be in the main file if compaction was interrupted.
+            if record is None or any(
+                item.account_id == account.account_id for item in record.accounts
+            ):
+                continue
+            records[entry["wallet_id"]] = record.with_account(account)
+        return entries
 
     def _write_all(self, records: Iterable[WalletRecord]) -> None:
-        payload = [record.to_dict() for record in records]
-        self._path.write_text(json.dumps(payload, indent=2))
+        data = json.dumps(
+            list(records), default=_json_default, separators=(",", ":")
+        ).encode("utf-8")
+        self._cache = None
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        with open(tmp_path, "wb") as handle:
+            handle.write(data)
+            if self._fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.replace(tmp_path, self._path)
+        # The main file now holds every journaled account.
+        self._journal_path.unlink(missing_ok=True)
+
+
+def _drop_torn_tail(handle: BinaryIO) -> None:
+    """Truncate an unterminated final journal line left by a crashed append."""
+
+    size = handle.seek(0, os.SEEK_END)
+    if not size:
+        return
+    handle.seek(size - 1)
+    if handle.read(1) == b"\n":
+        return
+    handle.seek(0)
+    handle.truncate(handle.read().rfind(b"\n") + 1)
@@ -1,7 +1,10 @@
 """Domain models for the wallet core."""
 
 from dataclasses import dataclass
+from enum import Enum
+from functools import cached_property, lru_cache
 from typing import Dict, Optional, Tuple
+import base64
 
 
 @dataclass(frozen=True)
@@ -15,10 +18,31 @@ class DerivationPath:
     address_index: int = 0
 
     def to_string(self) -> str:
-        return (
-            f"m/{self.purpose}'/{self.coin_type}'/"
-            f"{self.account}'/{self.change}/{self.address_index}"
-        )
+        return _path_to_string(self)
+
+
+@lru_cache(maxsize=256)
+def _path_to_string(path: DerivationPath) -> str:
+    return (
+        f"m/{path.purpose}'/{path.coin_type}'/"
+        f"{path.account}'/{path.change}/{path.address_index}"
+    )
+
+
+class CipherBackend(Enum):
+    HMAC_CTR = "HMAC_CTR"
+    AES_CTR = "AES_CTR"
+
+
+@dataclass(frozen=True)
+class EncryptedPayloadRaw:
+    """In-memory form of ``EncryptedPayload`` with decoded byte fields."""
+
+    ciphertext: bytes
+    salt: bytes
+    nonce: bytes
+    mac: bytes
+    cipher: CipherBackend = CipherBackend.HMAC_CTR
 
 
 @dataclass(frozen=True)
@@ -27,14 +51,43 @@ class EncryptedPayload:
     salt: str
     nonce: str
     mac: str
+    cipher: CipherBackend = CipherBackend.HMAC_CTR
+
+    def to_raw(self) -> EncryptedPayloadRaw:
+        return self._raw
+
+    @cached_property
+    def _raw(self) -> EncryptedPayloadRaw:
+        # Decoded once per instance; keystores hand back the same record on reuse.
+        return EncryptedPayloadRaw(
+            ciphertext=_b64decode(self.ciphertext),
+            salt=_b64decode(self.salt),
+            nonce=_b64decode(self.nonce),
+            mac=_b64decode(self.mac),
+            cipher=self.cipher,
+        )
+
+    @staticmethod
+    def from_raw(raw: EncryptedPayloadRaw) -> "EncryptedPayload":
+        return EncryptedPayload(
+            ciphertext=_b64encode(raw.ciphertext),
+            salt=_b64encode(raw.salt),
+            nonce=_b64encode(raw.nonce),
+            mac=_b64encode(raw.mac),
+            cipher=raw.cipher,
+        )
 
     def to_dict(self) -> Dict[str, str]:
-        return {
+        result = {
             "ciphertext": self.ciphertext,
             "salt": self.salt,
             "nonce": self.nonce,
             "mac": self.mac,
         }
+        # Omitted for the original cipher so existing keystores stay byte-identical.
+        if self.cipher is not CipherBackend.HMAC_CTR:
+            result["cipher"] = self.cipher.value
+        return result
 
     @staticmethod
     def from_dict(data: Dict[str, str]) -> "EncryptedPayload":
@@ -43,6 +96,7 @@ class EncryptedPayload:
             salt=data["salt"],
             nonce=data["nonce"],
             mac=data["mac"],
+            cipher=CipherBackend(data.get("cipher", CipherBackend.HMAC_CTR.value)),
         )
 
 
@@ -66,6 +120,15 @@ class WalletRecord:
     accounts: Tuple[Account, ...]
     encrypted_seed: EncryptedPayload
 
+    def with_account(self, account: Account) -> "WalletRecord":
+        if any(item.account_id == account.account_id for item in self.accounts):
+            raise ValueError("Account already exists for derivation path.")
+        return WalletRecord(
+            metadata=self.metadata,
+            accounts=self.accounts + (account,),
+            encrypted_seed=self.encrypted_seed,
+        )
+
     def to_dict(self) -> Dict[str, object]:
         return {
             "metadata": {
@@ -106,3 +169,41 @@ class WalletRecord:
             accounts=accounts,
             encrypted_seed=encrypted_seed,
         )
+
+
+def _json_default(obj: object) -> Dict[str, object]:
+    """``json.dumps`` hook emitting the same shape as ``WalletRecord.to_dict``.
+
+    Nested models are handed back to the encoder as-is, so serializing a
+    record does not first build a full nested dict copy.
+    """
+
+    if isinstance(obj, WalletRecord):
+        return {
+            "metadata": obj.metadata,
+            "accounts": obj.accounts,
+            "encrypted_seed": obj.encrypted_seed,
+        }
+    if isinstance(obj, WalletMetadata):
+        return {
+            "wallet_id": obj.wallet_id,
+            "label": obj.label,
+            "created_at": obj.created_at,
+        }
+    if isinstance(obj, Account):
+        return {
+            "account_id": obj.account_id,
+            "label": obj.label,
+            "derivation_path": obj.derivation_path,
+        }
+    if isinstance(obj, EncryptedPayload):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _b64encode(value: bytes) -> str:
+    return base64.b64encode(value).decode("ascii")
+
+
+def _b64decode(value: str) -> bytes:
+    return base64.b64decode(value.encode("ascii"))
@@ -1,22 +1,51 @@
 """Wallet core signing surface with explicit lock/unlock lifecycle."""
 
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Callable, Optional, Protocol, Tuple
-import base64
+from typing import Callable, Optional, Protocol, Tuple, Union
 import hashlib
 import hmac
-import secrets
+import os
+import threading
 
 from .keystore import KeyStore
-from .models import Account, DerivationPath, EncryptedPayload, WalletMetadata, WalletRecord
+from .models import (
+    Account,
+    CipherBackend,
+    DerivationPath,
+    EncryptedPayload,
+    EncryptedPayloadRaw,
+    WalletMetadata,
+    WalletRecord,
+)
+
+try:
+    import fastpbkdf2
+except ImportError:  # pragma: no cover - optional dependency
+    fastpbkdf2 = None
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:  # pragma: no cover - optional dependency
+    Cipher = None
+
+_DEFAULT_PATH_STR = DerivationPath().to_string()
+_MAC_SIZE = hashlib.sha256().digest_size
+
+_KDF_BACKENDS = {"hashlib": hashlib.pbkdf2_hmac}
+if fastpbkdf2 is not None:  # pragma: no cover - optional dependency
+    _KDF_BACKENDS["fastpbkdf2"] = fastpbkdf2.pbkdf2_hmac
 
 
 class Encryptor(Protocol):
     def encrypt(self, plaintext: bytes, passphrase: str) -> EncryptedPayload:
         ...
 
-    def decrypt(self, payload: EncryptedPayload, passphrase: str) -> bytes:
+    def decrypt(
+        self, payload: Union[EncryptedPayload, EncryptedPayloadRaw], passphrase: str
+    ) -> bytes:
         ...
 
 
@@ -28,39 +57,64 @@ class PassphraseEncryptor:
         iterations: int = 200_000,
         salt_provider: Optional[Callable[[int], bytes]] = None,
         nonce_provider: Optional[Callable[[int], bytes]] = None,
+        kdf_backend: str = "hashlib",
+        cipher_backend: CipherBackend = CipherBackend.HMAC_CTR,
     ) -> None:
+        if kdf_backend not in _KDF_BACKENDS:
+            raise ValueError(f"Unavailable KDF backend: {kdf_backend}")
+        _require_cipher(cipher_backend)
         self._iterations = iterations
-        self._salt_provider = salt_provider or secrets.token_bytes
-        self._nonce_provider = nonce_provider or secrets.token_bytes
+        self._cipher_backend = cipher_backend
+        self._pbkdf2 = _KDF_BACKENDS[kdf_backend]
+        self._salt_provider = salt_provider or os.urandom
+        self._nonce_provider = nonce_provider or os.urandom
 
     def encrypt(self, plaintext: bytes, passphrase: str) -> EncryptedPayload:
         salt = self._salt_provider(16)
         nonce = self._nonce_provider(16)
-        key = self._derive_key(passphrase, salt, nonce)
-        keystream = self._keystream(key, nonce, len(plaintext))
-        ciphertext = bytes(a ^ b for a, b in zip(plaintext, keystream))
-        mac = hmac.new(key, ciphertext, hashlib.sha256).digest()
-        return EncryptedPayload(
-            ciphertext=_b64encode(ciphertext),
-            salt=_b64encode(salt),
-            nonce=_b64encode(nonce),
-            mac=_b64encode(mac),
+        enc_key, mac_key = _split_key(
+            self._cipher_backend, self._derive_key(passphrase, salt, nonce)
+        )
+        ciphertext = self._apply_cipher(self._cipher_backend, enc_key, nonce, plaintext)
+        mac = _payload_mac(mac_key, self._cipher_backend, ciphertext)
+        return EncryptedPayload.from_raw(
+            EncryptedPayloadRaw(
+                ciphertext=ciphertext,
+                salt=salt,
+                nonce=nonce,
+                mac=mac,
+                cipher=self._cipher_backend,
+            )
         )
 
-    def decrypt(self, payload: EncryptedPayload, passphrase: str) -> bytes:
-        salt = _b64decode(payload.salt)
-        nonce = _b64decode(payload.nonce)
-        ciphertext = _b64decode(payload.ciphertext)
-        expected_mac = _b64decode(payload.mac)
-        key = self._derive_key(passphrase, salt, nonce)
-        actual_mac = hmac.new(key, ciphertext, hashlib.sha256).digest()
-        if not hmac.compare_digest(actual_mac, expected_mac):
+    def decrypt(
+        self, payload: Union[EncryptedPayload, EncryptedPayloadRaw], passphrase: str
+    ) -> bytes:
+        raw = payload if isinstance(payload, EncryptedPayloadRaw) else payload.to_raw()
+        if len(raw.mac) != _MAC_SIZE:
+            # Cannot match any HMAC-SHA256 tag; skip the expensive KDF.
+            raise ValueError("Invalid passphrase or corrupted payload.")
+        _require_cipher(raw.cipher)
+        enc_key, mac_key = _split_key(
+            raw.cipher, self._derive_key(passphrase, raw.salt, raw.nonce)
+        )
+        actual_mac = _payload_mac(mac_key, raw.cipher, raw.ciphertext)
+        if not hmac.compare_digest(actual_mac, raw.mac):
             raise ValueError("Invalid passphrase or corrupted payload.")
-        keystream = self._keystream(key, nonce, len(ciphertext))
-        return bytes(a ^ b for a, b in zip(ciphertext, keystream))
+        return self._apply_cipher(raw.cipher, enc_key, raw.nonce, raw.ciphertext)
+
+    def _apply_cipher(
+        self, cipher: CipherBackend, key: bytes, nonce: bytes, data: bytes
+    ) -> bytes:
+        # Both backends are XOR stream ciphers, so this encrypts and decrypts.
+        if cipher is CipherBackend.AES_CTR:
+            counter_block = nonce[:16].ljust(16, b"\x00")
+            context = Cipher(algorithms.AES(key), modes.CTR(counter_block)).encryptor()
+            return context.update(data) + context.finalize()
+        return _xor_bytes(data, self._keystream(key, nonce, len(data)))
 
     def _derive_key(self, passphrase: str, salt: bytes, nonce: bytes) -> bytes:
-        return hashlib.pbkdf2_hmac(
+        return self._pbkdf2(
             "sha256",
             passphrase.encode("utf-8"),
             salt + nonce,
@@ -69,13 +123,20 @@ class PassphraseEncryptor:
         )
 
     def _keystream(self, key: bytes, nonce: bytes, length: int) -> bytes:
-        blocks = []
+        # Key the HMAC once and fork it per block instead of re-padding the key.
+        base = hmac.new(key, nonce, hashlib.sha256)
+        out = bytearray(length)
         counter = 0
-        while sum(len(block) for block in blocks) < length:
-            counter_bytes = counter.to_bytes(4, "big")
-            blocks.append(hmac.new(key, nonce + counter_bytes, hashlib.sha256).digest())
+        position = 0
+        while position < length:
+            block = base.copy()
+            block.update(counter.to_bytes(4, "big"))
+            digest = block.digest()
+            end = min(position + len(digest), length)
+            out[position:end] = digest[: end - position]
+            position = end
             counter += 1
-        return b"".join(blocks)[:length]
+        return bytes(out)
 
 
 @dataclass(frozen=True)
@@ -87,6 +148,12 @@ class WalletStatus:
 class WalletCore:
     """Local-only wallet core with deterministic signing."""
 
+    max_cache_size = 1000
+    # Shared by all instances; threads are only spawned on first submit.
+    _executor = ThreadPoolExecutor(
+        max_workers=os.cpu_count(), thread_name_prefix="wallet-unlock"
+    )
+
     def __init__(
         self,
         keystore: KeyStore,
@@ -97,9 +164,13 @@ class WalletCore:
         self._keystore = keystore
         self._encryptor = encryptor
         self._time_provider = time_provider or _utc_timestamp
-        self._entropy_provider = entropy_provider or secrets.token_bytes
+        self._entropy_provider = entropy_provider or os.urandom
         self._unlocked_wallet_id: Optional[str] = None
         self._unlocked_seed: Optional[bytes] = None
+        # Keys derived from the unlocked seed; dropped whenever the seed changes.
+        self._key_cache: "OrderedDict[Tuple[str, str, str], object]" = OrderedDict()
+        # Guards the seed/wallet swap and the key cache against unlock_async.
+        self._lock = threading.Lock()
 
     def create_wallet(self, label: str, passphrase: str) -> WalletMetadata:
         seed = self._entropy_provider(32)
@@ -121,18 +192,25 @@ class WalletCore:
     def add_account(
         self, wallet_id: str, label: str, derivation_path: Optional[str] = None
     ) -> Account:
-        record = self._keystore.load(wallet_id)
-        path = derivation_path or DerivationPath().to_string()
+        """Add an account, using the keystore's ``append_account`` when present.
+
+        ``append_account(wallet_id, account)`` is an optional keystore hook that
+        persists one account without rewriting the record. Keystores without it,
+        or whose hook raises ``NotImplementedError``, get ``load`` + ``store``.
+        """
+
+        path = derivation_path or _DEFAULT_PATH_STR
         account_id = _derive_account_id(wallet_id, path)
-        if any(account.account_id == account_id for account in record.accounts):
-            raise ValueError("Account already exists for derivation path.")
         account = Account(account_id=account_id, label=label, derivation_path=path)
-        updated = WalletRecord(
-            metadata=record.metadata,
-            accounts=record.accounts + (account,),
-            encrypted_seed=record.encrypted_seed,
-        )
-        self._keystore.store(updated)
+        append_account = getattr(self._keystore, "append_account", None)
+        if append_account is not None:
+            try:
+                append_account(wallet_id, account)
+                return account
+            except NotImplementedError:
+                pass
+        record = self._keystore.load(wallet_id)
+        self._keystore.store(record.with_account(account))
         return account
 
     def list_accounts(self, wallet_id: str) -> Tuple[Account, ...]:
@@ -141,13 +219,28 @@ class WalletCore:
     def unlock(self, wallet_id: str, passphrase: str) -> WalletStatus:
         record = self._keystore.load(wallet_id)
         seed = self._encryptor.decrypt(record.encrypted_seed, passphrase)
-        self._unlocked_seed = seed
-        self._unlocked_wallet_id = wallet_id
+        with self._lock:
+            self._key_cache.clear()
+            self._unlocked_seed = seed
+            self._unlocked_wallet_id = wallet_id
         return WalletStatus(wallet_id=wallet_id, unlocked=True)
 
+    def unlock_async(self, wallet_id: str, passphrase: str) -> "Future[WalletStatus]":
+        """Run ``unlock`` on the shared worker pool.
+
+        ``hashlib.pbkdf2_hmac`` releases the GIL, so unlocking several
+        independent ``WalletCore`` instances this way proceeds in parallel.
+        The instance stays usable meanwhile; keys derived from the previous
+        seed are never cached once the new seed is swapped in.
+        """
+
+        return self._executor.submit(self.unlock, wallet_id, passphrase)
+
     def lock(self) -> None:
-        self._unlocked_seed = None
-        self._unlocked_wallet_id = None
+        with self._lock:
+            self._key_cache.clear()
+            self._unlocked_seed = None
+            self._unlocked_wallet_id = None
 
     def status(self, wallet_id: str) -> WalletStatus:
         return WalletStatus(
@@ -157,30 +250,98 @@ class WalletCore:
 
     def get_public_key(self, wallet_id: str, derivation_path: str) -> str:
         seed = self._require_unlocked(wallet_id)
-        private_key = _derive_private_key(seed, derivation_path)
-        return _derive_public_key(private_key)
+        key = (wallet_id, derivation_path, "pub")
+        public_key = self._cache_get(key)
+        if public_key is None:
+            private_key = self._private_key(seed, wallet_id, derivation_path)
+            public_key = self._cache_put(seed, key, _derive_public_key(private_key))
+        return public_key
 
     def sign(self, wallet_id: str, derivation_path: str, payload: bytes) -> str:
         seed = self._require_unlocked(wallet_id)
-        private_key = _derive_private_key(seed, derivation_path)
-        return hmac.new(private_key, payload, hashlib.sha256).hexdigest()
+        key = (wallet_id, derivation_path, "hmac")
+        template = self._cache_get(key)
+        if template is None:
+            # Keyed once per path; copies skip re-deriving the HMAC pads.
+            private_key = self._private_key(seed, wallet_id, derivation_path)
+            template = self._cache_put(
+                seed, key, hmac.new(private_key, digestmod=hashlib.sha256)
+            )
+        signer = template.copy()
+        signer.update(payload)
+        return signer.hexdigest()
 
     def export_recovery_phrase(self, wallet_id: str) -> str:
         seed = self._require_unlocked(wallet_id)
         return _seed_to_phrase(seed)
 
     def _require_unlocked(self, wallet_id: str) -> bytes:
-        if self._unlocked_seed is None or self._unlocked_wallet_id != wallet_id:
-            raise RuntimeError("Wallet is locked.")
-        return self._unlocked_seed
-
-
-def _b64encode(value: bytes) -> str:
-    return base64.b64encode(value).decode("ascii")
-
-
-def _b64decode(value: str) -> bytes:
-    return base64.b64decode(value.encode("ascii"))
+        with self._lock:
+            seed = self._unlocked_seed
+            if seed is None or self._unlocked_wallet_id != wallet_id:
+                raise RuntimeError("Wallet is locked.")
+        return seed
+
+    def _private_key(self, seed: bytes, wallet_id: str, derivation_path: str) -> bytes:
+        key = (wallet_id, derivation_path, "priv")
+        private_key = self._cache_get(key)
+        if private_key is None:
+            private_key = self._cache_put(
+                seed, key, _derive_private_key(seed, derivation_path)
+            )
+        return private_key
+
+    def _cache_get(self, key: Tuple[str, str, str]):
+        with self._lock:
+            value = self._key_cache.get(key)
+            if value is not None:
+                self._key_cache.move_to_end(key)
+        return value
+
+    def _cache_put(self, seed: bytes, key: Tuple[str, str, str], value):
+        with self._lock:
+            # Skip caching if the seed was swapped while ``value`` was derived.
+            if seed is self._unlocked_seed:
+                self._key_cache[key] = value
+                if len(self._key_cache) > self.max_cache_size:
+                    self._key_cache.popitem(last=False)
+        return value
+
+
+def _require_cipher(cipher: CipherBackend) -> None:
+    if cipher is CipherBackend.AES_CTR and Cipher is None:
+        raise ValueError("AES_CTR requires the optional 'cryptography' package.")
+
+
+def _split_key(cipher: CipherBackend, key: bytes) -> Tuple[bytes, bytes]:
+    """Return ``(encryption_key, mac_key)`` for a derived passphrase key."""
+
+    # HMAC_CTR keeps its original single-key layout for existing keystores.
+    if cipher is CipherBackend.HMAC_CTR:
+        return key, key
+    return (
+        hmac.new(key, b"enc", hashlib.sha256).digest(),
+        hmac.new(key, b"mac", hashlib.sha256).digest(),
+    )
+
+
+def _payload_mac(key: bytes, cipher: CipherBackend, ciphertext: bytes) -> bytes:
+    """HMAC the ciphertext, binding non-default cipher tags into the tag."""
+
+    mac = hmac.new(key, digestmod=hashlib.sha256)
+    # HMAC_CTR payloads keep the original ciphertext-only MAC.
+    if cipher is not CipherBackend.HMAC_CTR:
+        mac.update(cipher.value.encode("ascii") + b"\x00")
+    mac.update(ciphertext)
+    return mac.digest()
+
+
+def _xor_bytes(data: bytes, keystream: bytes) -> bytes:
+    """XOR equal-length buffers as big integers instead of byte by byte."""
+
+    return (
+        int.from_bytes(data, "big") ^ int.from_bytes(keystream, "big")
+    ).to_bytes(len(data), "big")
 
 
 def _utc_timestamp() -> str:
@@ -188,11 +349,14 @@ def _utc_timestamp() -> str:
 
 
 def _derive_wallet_id(seed: bytes) -> str:
-    return hashlib.sha256(seed).hexdigest()[:16]
+    return hashlib.sha256(seed).digest()[:8].hex()
 
 
 def _derive_account_id(wallet_id: str, path: str) -> str:
-    return hashlib.sha256(f"{wallet_id}:{path}".encode("utf-8")).hexdigest()[:16]
+    digest = hashlib.sha256(wallet_id.encode("utf-8"))
+    digest.update(b":")
+    digest.update(path.encode("utf-8"))
+    return digest.digest()[:8].hex()
 
 
 def _derive_private_key(seed: bytes, path: str) -> bytes:
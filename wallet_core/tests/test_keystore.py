@@ -0,0 +1,165 @@
+"""Persistence tests for the file-backed keystore."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from wallet_core.keystore import FileKeyStore
+from wallet_core.models import Account, EncryptedPayload, WalletMetadata, WalletRecord
+
+
+def _record(wallet_id: str, label: str = "Primary") -> WalletRecord:
+    return WalletRecord(
+        metadata=WalletMetadata(
+            wallet_id=wallet_id,
+            label=label,
+            created_at="2024-01-01T00:00:00Z",
+        ),
+        accounts=(Account(account_id="acct", label="default", derivation_path="m/0"),),
+        encrypted_seed=EncryptedPayload(ciphertext="YQ==", salt="Yg==", nonce="Yw==", mac="ZA=="),
+    )
+
+
+class FileKeyStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.path = Path(self.tempdir.name) / "keystore.json"
+
+    def test_missing_file_is_empty(self) -> None:
+        keystore = FileKeyStore(self.path)
+        self.assertEqual(keystore.list_metadata(), ())
+        with self.assertRaises(KeyError):
+            keystore.load("missing")
+
+    def test_round_trip_uses_compact_json(self) -> None:
+        keystore = FileKeyStore(self.path)
+        keystore.store(_record("w1"))
+        keystore.store(_record("w2"))
+
+        self.assertEqual(keystore.load("w1"), _record("w1"))
+        self.assertEqual(
+            [meta.wallet_id for meta in keystore.list_metadata()],
+            ["w1", "w2"],
+        )
+        self.assertNotIn("\n", self.path.read_text())
+
+    def test_store_replaces_file_atomically(self) -> None:
+        keystore = FileKeyStore(self.path, fsync=True)
+        keystore.store(_record("w1"))
+        keystore.store(_record("w1", label="Updated"))
+
+        self.assertEqual(keystore.load("w1").metadata.label, "Updated")
+        self.assertEqual([item.name for item in self.path.parent.iterdir()], ["keystore.json"])
+
+    def test_reads_pick_up_external_changes(self) -> None:
+        keystore = FileKeyStore(self.path)
+        keystore.store(_record("w1"))
+        self.assertEqual(keystore.load("w1").metadata.label, "Primary")
+
+        self.path.write_text(json.dumps([_record("w1", label="Renamed").to_dict()], indent=2))
+
+        self.assertEqual(keystore.load("w1").metadata.label, "Renamed")
+
+    def test_separate_instances_share_file_state(self) -> None:
+        FileKeyStore(self.path).store(_record("w1"))
+        reader = FileKeyStore(self.path)
+        self.assertEqual(reader.load("w1"), _record("w1"))
+
+        FileKeyStore(self.path).store(_record("w2"))
+        self.assertEqual(len(reader.list_metadata()), 2)
+
+    def test_append_account_rejects_duplicates(self) -> None:
+        keystore = FileKeyStore(self.path)
+        keystore.store(_record("w1"))
+        extra = Account(account_id="acct-2", label="second", derivation_path="m/1")
+
+        keystore.append_account("w1", extra)
+
+        self.assertEqual(keystore.load("w1").accounts[-1], extra)
+        with self.assertRaises(ValueError):
+            keystore.append_account("w1", extra)
+        with self.assertRaises(KeyError):
+            keystore.append_account("missing", extra)
+
+    def test_append_account_journals_without_rewriting(self) -> None:
+        keystore = FileKeyStore(self.path)
+        keystore.store(_record("w1"))
+        before = self.path.read_bytes()
+        extra = Account(account_id="acct-2", label="second", derivation_path="m/1")
+
+        keystore.append_account("w1", extra)
+
+        self.assertEqual(self.path.read_bytes(), before)
+        self.assertTrue(keystore.journal_path.exists())
+        self.assertEqual(FileKeyStore(self.path).load("w1").accounts[-1], extra)
+
+        keystore.compact()
+        self.assertFalse(keystore.journal_path.exists())
+        self.assertEqual(FileKeyStore(self.path).load("w1").accounts[-1], extra)
+
+    def test_journal_compacts_at_threshold(self) -> None:
+        keystore = FileKeyStore(self.path, compact_every=2)
+        keystore.store(_record("w1"))
+        for index in range(2):
+            account = Account(account_id=f"extra-{index}", label="x", derivation_path=f"m/{index}")
+            keystore.append_account("w1", account)
+
+        self.assertFalse(keystore.journal_path.exists())
+        self.assertEqual(len(keystore.load("w1").accounts), 3)
+
+    def test_torn_journal_tail_is_ignored(self) -> None:
+        keystore = FileKeyStore(self.path)
+        keystore.store(_record("w1"))
+        extra = Account(account_id="acct-2", label="second", derivation_path="m/1")
+        keystore.append_account("w1", extra)
+        with open(keystore.journal_path, "a") as handle:
+            handle.write('{"wallet_id":"w1","acc')
+
+        self.assertEqual(FileKeyStore(self.path).load("w1").accounts[-1], extra)
+
+    def test_append_after_torn_tail_is_kept(self) -> None:
+        keystore = FileKeyStore(self.path)
+        keystore.store(_record("w1"))
+        keystore.append_account("w1", Account(account_id="a0", label="x", derivation_path="m/0"))
+        with open(keystore.journal_path, "a") as handle:
+            handle.write('{"wallet_id":"w1","acc')
+
+        for index in (1, 2):
+            account = Account(account_id=f"a{index}", label="x", derivation_path=f"m/{index}")
+            keystore.append_account("w1", account)
+
+        expected = ["acct", "a0", "a1", "a2"]
+        reloaded = FileKeyStore(self.path)
+        self.assertEqual([item.account_id for item in reloaded.load("w1").accounts], expected)
+        reloaded.compact()
+        self.assertEqual(
+            [item.account_id for item in FileKeyStore(self.path).load("w1").accounts], expected
+        )
+
+    def test_append_account_does_not_reparse_keystore(self) -> None:
+        keystore = FileKeyStore(self.path)
+        for index in range(20):
+            keystore.store(_record(f"w{index}"))
+        keystore.load("w0")
+
+        original = WalletRecord.from_dict
+        calls = []
+
+        def counting_from_dict(data):
+            calls.append(data)
+            return original(data)
+
+        WalletRecord.from_dict = staticmethod(counting_from_dict)
+        self.addCleanup(setattr, WalletRecord, "from_dict", staticmethod(original))
+        for index in range(5):
+            account = Account(account_id=f"extra-{index}", label="x", derivation_path=f"m/{index}")
+            keystore.append_account("w0", account)
+
+        self.assertEqual(calls, [])
+        self.assertEqual(len(keystore.load("w0").accounts), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
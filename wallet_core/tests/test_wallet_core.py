@@ -2,11 +2,23 @@
 
 import unittest
 import base64
+import hashlib
+import hmac
 import json
 
-from wallet_core.models import DerivationPath
+from wallet_core.models import (
+    CipherBackend,
+    DerivationPath,
+    EncryptedPayload,
+    EncryptedPayloadRaw,
+)
 from wallet_core.signer import PassphraseEncryptor, WalletCore
 
+try:
+    import cryptography
+except ImportError:  # pragma: no cover - optional dependency
+    cryptography = None
+
 
 class WalletCoreTests(unittest.TestCase):
     class InMemoryKeyStore:
@@ -24,6 +36,9 @@ class WalletCoreTests(unittest.TestCase):
         def list_metadata(self):
             return tuple(record.metadata for record in self._records.values())
 
+        def append_account(self, wallet_id: str, account) -> None:
+            self._records[wallet_id] = self.load(wallet_id).with_account(account)
+
     def _make_wallet(self, seed: bytes):
         keystore = self.InMemoryKeyStore()
         encryptor = PassphraseEncryptor(
@@ -69,6 +84,53 @@ class WalletCoreTests(unittest.TestCase):
         with self.assertRaises(RuntimeError):
             wallet.sign(metadata.wallet_id, path, b"payload")
 
+    def test_unlock_async_resolves_to_status(self) -> None:
+        seed = b"\x0b" * 32
+        wallet, _, metadata = self._make_wallet(seed)
+        status = wallet.unlock_async(metadata.wallet_id, "pass").result(timeout=30)
+        self.assertTrue(status.unlocked)
+        self.assertTrue(wallet.status(metadata.wallet_id).unlocked)
+
+        with self.assertRaises(ValueError):
+            wallet.unlock_async(metadata.wallet_id, "wrong").result(timeout=30)
+
+    def test_keys_from_a_replaced_seed_are_not_cached(self) -> None:
+        seed = b"\x0c" * 32
+        wallet, _, metadata = self._make_wallet(seed)
+        wallet.unlock(metadata.wallet_id, "pass")
+        stale_seed = wallet._require_unlocked(metadata.wallet_id)
+        wallet.unlock(metadata.wallet_id, "pass")
+
+        path = DerivationPath().to_string()
+        wallet._private_key(stale_seed, metadata.wallet_id, path)
+        self.assertEqual(len(wallet._key_cache), 0)
+        wallet.get_public_key(metadata.wallet_id, path)
+        self.assertEqual(len(wallet._key_cache), 2)
+
+    def test_add_account_falls_back_to_store(self) -> None:
+        class StoreOnlyKeyStore:
+            def __init__(self, inner) -> None:
+                self._inner = inner
+
+            def store(self, record) -> None:
+                self._inner.store(record)
+
+            def load(self, wallet_id: str):
+                return self._inner.load(wallet_id)
+
+            def list_metadata(self):
+                return self._inner.list_metadata()
+
+        _, keystore, metadata = self._make_wallet(b"\x0c" * 32)
+        wallet = WalletCore(
+            keystore=StoreOnlyKeyStore(keystore), encryptor=PassphraseEncryptor()
+        )
+        account = wallet.add_account(metadata.wallet_id, "default")
+
+        self.assertEqual(wallet.list_accounts(metadata.wallet_id), (account,))
+        with self.assertRaises(ValueError):
+            wallet.add_account(metadata.wallet_id, "again")
+
     def test_wrong_passphrase_fails(self) -> None:
         seed = b"\x03" * 32
         wallet, _, metadata = self._make_wallet(seed)
@@ -129,6 +191,97 @@ class WalletCoreTests(unittest.TestCase):
         record_after = keystore.load(metadata.wallet_id).to_dict()
         self.assertEqual(record_before, record_after)
 
+    def test_derived_key_cache_is_bounded_and_cleared_on_lock(self) -> None:
+        seed = b"\x0a" * 32
+        wallet, _, metadata = self._make_wallet(seed)
+        wallet.max_cache_size = 2
+        wallet.unlock(metadata.wallet_id, "pass")
+        paths = [DerivationPath(account=index).to_string() for index in range(3)]
+
+        first = [wallet.sign(metadata.wallet_id, path, b"payload") for path in paths]
+        second = [wallet.sign(metadata.wallet_id, path, b"payload") for path in paths]
+        self.assertEqual(first, second)
+        self.assertLessEqual(len(wallet._key_cache), 2)
+
+        wallet.lock()
+        self.assertEqual(len(wallet._key_cache), 0)
+        with self.assertRaises(RuntimeError):
+            wallet.get_public_key(metadata.wallet_id, paths[0])
+
+    def test_large_payload_round_trip(self) -> None:
+        encryptor = PassphraseEncryptor(iterations=1)
+        plaintext = bytes(range(256)) * 300
+        payload = encryptor.encrypt(plaintext, "pass")
+        self.assertNotEqual(base64.b64decode(payload.ciphertext), plaintext)
+        self.assertEqual(encryptor.decrypt(payload, "pass"), plaintext)
+
+    def test_decrypt_accepts_raw_payload(self) -> None:
+        encryptor = PassphraseEncryptor(iterations=1)
+        payload = encryptor.encrypt(b"secret", "pass")
+        raw = payload.to_raw()
+
+        self.assertEqual(raw.ciphertext, base64.b64decode(payload.ciphertext))
+        self.assertEqual(EncryptedPayload.from_raw(raw), payload)
+        self.assertEqual(encryptor.decrypt(raw, "pass"), b"secret")
+        self.assertEqual(encryptor.decrypt(payload, "pass"), b"secret")
+
+    def test_truncated_mac_is_rejected(self) -> None:
+        encryptor = PassphraseEncryptor(iterations=1)
+        raw = encryptor.encrypt(b"secret", "pass").to_raw()
+        truncated = EncryptedPayloadRaw(
+            ciphertext=raw.ciphertext, salt=raw.salt, nonce=raw.nonce, mac=raw.mac[:-1]
+        )
+        with self.assertRaises(ValueError):
+            encryptor.decrypt(truncated, "pass")
+
+    @unittest.skipIf(cryptography is None, "cryptography not available")
+    def test_aes_ctr_backend_round_trip(self) -> None:
+        encryptor = PassphraseEncryptor(iterations=1, cipher_backend=CipherBackend.AES_CTR)
+        payload = encryptor.encrypt(b"secret" * 10, "pass")
+
+        self.assertEqual(payload.to_dict()["cipher"], "AES_CTR")
+        restored = EncryptedPayload.from_dict(payload.to_dict())
+        plaintext = PassphraseEncryptor(iterations=1).decrypt(restored, "pass")
+        self.assertEqual(plaintext, b"secret" * 10)
+        with self.assertRaises(ValueError):
+            encryptor.decrypt(payload, "wrong")
+
+    @unittest.skipIf(cryptography is None, "cryptography not available")
+    def test_stripped_cipher_tag_is_rejected(self) -> None:
+        encryptor = PassphraseEncryptor(iterations=1, cipher_backend=CipherBackend.AES_CTR)
+        data = encryptor.encrypt(b"secret" * 10, "pass").to_dict()
+        del data["cipher"]
+
+        with self.assertRaises(ValueError):
+            encryptor.decrypt(EncryptedPayload.from_dict(data), "pass")
+
+    @unittest.skipIf(cryptography is None, "cryptography not available")
+    def test_aes_uses_separate_encryption_and_mac_keys(self) -> None:
+        encryptor = PassphraseEncryptor(iterations=1, cipher_backend=CipherBackend.AES_CTR)
+        raw = encryptor.encrypt(b"secret" * 10, "pass").to_raw()
+        key = encryptor._derive_key("pass", raw.salt, raw.nonce)
+
+        single_key_mac = hmac.new(key, b"AES_CTR\x00" + raw.ciphertext, hashlib.sha256)
+        self.assertNotEqual(raw.mac, single_key_mac.digest())
+        single_key_plain = encryptor._apply_cipher(
+            CipherBackend.AES_CTR, key, raw.nonce, raw.ciphertext
+        )
+        self.assertNotEqual(single_key_plain, b"secret" * 10)
+
+    def test_default_cipher_is_not_serialized(self) -> None:
+        payload = PassphraseEncryptor(iterations=1).encrypt(b"secret", "pass")
+        self.assertNotIn("cipher", payload.to_dict())
+        restored = EncryptedPayload.from_dict(payload.to_dict())
+        self.assertIs(restored.cipher, CipherBackend.HMAC_CTR)
+
+    def test_unavailable_kdf_backend_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            PassphraseEncryptor(kdf_backend="scrypt")
+
+        encryptor = PassphraseEncryptor(iterations=1, kdf_backend="hashlib")
+        payload = encryptor.encrypt(b"secret", "pass")
+        self.assertEqual(encryptor.decrypt(payload, "pass"), b"secret")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -33,6 +33,7 @@ class WebApiTests(unittest.TestCase):
         )
         metadata = wallet.create_wallet(label="Primary", passphrase="pass")
         account = wallet.add_account(metadata.wallet_id, "default", DerivationPath().to_string())
+        self.wallet = wallet
         self.wallet_id = metadata.wallet_id
         self.account_id = account.account_id
         web_app._set_active_account(self.keystore_path, self.wallet_id, self.account_id)
@@ -93,11 +94,9 @@ class WebApiTests(unittest.TestCase):
         self.assertEqual(status["wallet_state"], "LOCKED")
 
     def test_accounts_list_and_select(self) -> None:
-        wallet = WalletCore(
-            keystore=FileKeyStore(Path(self.keystore_path)),
-            encryptor=PassphraseEncryptor(),
+        account_two = self.wallet.add_account(
+            self.wallet_id, "secondary", "m/44'/0'/1'/0/0"
         )
-        account_two = wallet.add_account(self.wallet_id, "secondary", "m/44'/0'/1'/0/0")
 
         response = self.client.get("/api/accounts")
         self.assertEqual(response.status_code, 200)
@@ -1,6 +1,7 @@
 """API contract and safety tests for the web adapter."""
 
-import contextlib
+import json
+import os
 import tempfile
 from pathlib import Path
 
@@ -25,158 +26,149 @@ from wallet_core.models import DerivationPath
 from wallet_core.signer import PassphraseEncryptor, WalletCore
 
 
-@contextlib.contextmanager
-def _client_with_context():
-    if TestClient is None or app is None:
-        raise RuntimeError("FastAPI not available")
-    client = TestClient(app)
-    with tempfile.TemporaryDirectory() as tempdir:
-        keystore_path = Path(tempdir) / "keystore.json"
-        keystore = FileKeyStore(keystore_path)
-        wallet = WalletCore(
-            keystore=keystore,
-            encryptor=PassphraseEncryptor(),
-            time_provider=lambda: "2024-01-01T00:00:00Z",
-            entropy_provider=lambda n: b"\x01" * n,
-        )
-        metadata = wallet.create_wallet(label="Primary", passphrase="pass")
-        wallet.add_account(metadata.wallet_id, "default", DerivationPath().to_string())
-        response = client.post(
-            "/api/context",
-            json={"keystore_path": str(keystore_path), "wallet_id": metadata.wallet_id},
-        )
-        if response.status_code != 200:
-            raise RuntimeError("Failed to set context")
-        yield client, metadata.wallet_id
+def _create_context_wallet(tempdir: str) -> tuple:
+    """Create the keystore that context-requiring tests point the app at."""
+
+    keystore_path = Path(tempdir) / "keystore.json"
+    keystore = FileKeyStore(keystore_path)
+    wallet = WalletCore(
+        keystore=keystore,
+        # Neither context test decrypts the seed, so KDF strength is irrelevant.
+        encryptor=PassphraseEncryptor(iterations=1),
+        time_provider=lambda: "2024-01-01T00:00:00Z",
+        entropy_provider=lambda n: b"\x01" * n,
+    )
+    metadata = wallet.create_wallet(label="Primary", passphrase="pass")
+    wallet.add_account(metadata.wallet_id, "default", DerivationPath().to_string())
+    # add_account journals the account; fold it in so keystore.json is complete.
+    keystore.compact()
+    return keystore_path, metadata.wallet_id
+
+
+def _plan_body(action_type: str, to_asset: str, amount: float) -> dict:
+    return {
+        "snapshot_id": "snap-1",
+        "exposures": [{"asset_code": "USD", "quantity": 1000}],
+        "intent": {
+            "action_type": action_type,
+            "from_asset": "USD",
+            "to_asset": to_asset,
+            "amount": amount,
+        },
+    }
+
+
+# (case name, action_type, amount); each must be rejected with 400.
+_INVALID_INTENTS = (
+    ("invalid_action_type", "NUKE", 100),
+    ("negative_amount", "TRANSFER", -100),
+)
+
+
+# Opt-in fast lane: set THRIVE_SKIP_SLOW_TESTS=1 to skip tests that need a wallet.
+_SKIP_SLOW = os.environ.get("THRIVE_SKIP_SLOW_TESTS") == "1"
+_slow = unittest.skipIf(_SKIP_SLOW, "slow test skipped (THRIVE_SKIP_SLOW_TESTS=1)")
+
+_JSON_HEADERS = {"content-type": "application/json"}
+_HOLD_PLAN_BODY = json.dumps(_plan_body("HOLD", "USD", 0)).encode("utf-8")
+
+
+def _execute_body(plan: dict) -> bytes:
+    return json.dumps({"plan": plan, "confirm_all": True}).encode("utf-8")
 
 
 @unittest.skipIf(TestClient is None or app is None, "FastAPI not available")
 class WebBreakItTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # One client for the class, entered so app lifespan runs once.
+        cls._client = TestClient(app).__enter__()
+        # Class cleanups still run if the rest of setUpClass raises.
+        cls.addClassCleanup(cls._client.__exit__, None, None, None)
+        # The wallet (and its passphrase KDF) is built once; tests only re-post
+        # /api/context, since setUp clears the app's in-memory context.
+        cls._tempdir = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(cls._tempdir.cleanup)
+        if not _SKIP_SLOW:
+            cls._keystore_path, cls._wallet_id = _create_context_wallet(cls._tempdir.name)
+            cls._keystore_bytes = cls._keystore_path.read_bytes()
+
     def setUp(self) -> None:
         if web_app is not None:
             web_app._reset_state()
 
+    def _set_context(self):
+        # Restore the pristine keystore in case an earlier test wrote to it.
+        self._keystore_path.write_bytes(self._keystore_bytes)
+        FileKeyStore(self._keystore_path).journal_path.unlink(missing_ok=True)
+        response = self._client.post(
+            "/api/context",
+            json={"keystore_path": str(self._keystore_path), "wallet_id": self._wallet_id},
+        )
+        self.assertEqual(response.status_code, 200)
+        return self._client
+
+    def _create_hold_plan(self) -> dict:
+        response = self._client.post(
+            "/api/plans", content=_HOLD_PLAN_BODY, headers=_JSON_HEADERS
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
     def test_app_boots(self) -> None:
-        client = TestClient(app)
+        client = self._client
         response = client.get("/")
         self.assertIn(response.status_code, (200, 302))
 
     def test_no_context_protection(self) -> None:
-        client = TestClient(app)
+        client = self._client
         response = client.post("/api/wallet/unlock", json={"passphrase": "x"})
         self.assertEqual(response.status_code, 400)
 
+    @_slow
     def test_seed_export_requires_consent(self) -> None:
-        with _client_with_context() as (client, _wallet_id):
-            response = client.post(
-                "/api/wallet/seed",
-                json={"passphrase": "pass", "acknowledge_warning": False},
-            )
-            self.assertIn(response.status_code, (400, 403))
+        client = self._set_context()
+        response = client.post(
+            "/api/wallet/seed",
+            json={"passphrase": "pass", "acknowledge_warning": False},
+        )
+        self.assertIn(response.status_code, (400, 403))
 
     def test_execute_requires_arm(self) -> None:
-        client = TestClient(app)
-        plan_response = client.post(
-            "/api/plans",
-            json={
-                "snapshot_id": "snap-1",
-                "exposures": [{"asset_code": "USD", "quantity": 1000}],
-                "intent": {
-                    "action_type": "HOLD",
-                    "from_asset": "USD",
-                    "to_asset": "USD",
-                    "amount": 0,
-                },
-            },
+        plan = self._create_hold_plan()
+        response = self._client.post(
+            "/api/execute", content=_execute_body(plan), headers=_JSON_HEADERS
         )
-        self.assertEqual(plan_response.status_code, 200)
-        plan = plan_response.json()
-
-        response = client.post("/api/execute", json={"plan": plan, "confirm_all": True})
         self.assertIn(response.status_code, (400, 403))
 
+    @_slow
     def test_json_contracts(self) -> None:
-        with _client_with_context() as (client, _wallet_id):
-            response = client.get("/api/status?json=1")
-            self.assertEqual(response.status_code, 200)
-            self.assertIsInstance(response.json(), dict)
+        client = self._set_context()
+        response = client.get("/api/status?json=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.json(), dict)
 
     def test_double_execute_blocked(self) -> None:
-        client = TestClient(app)
-        plan_response = client.post(
-            "/api/plans",
-            json={
-                "snapshot_id": "snap-1",
-                "exposures": [{"asset_code": "USD", "quantity": 1000}],
-                "intent": {
-                    "action_type": "HOLD",
-                    "from_asset": "USD",
-                    "to_asset": "USD",
-                    "amount": 0,
-                },
-            },
-        )
-        self.assertEqual(plan_response.status_code, 200)
-        plan = plan_response.json()
+        body = _execute_body(self._create_hold_plan())
 
-        r1 = client.post("/api/execute", json={"plan": plan, "confirm_all": True})
-        r2 = client.post("/api/execute", json={"plan": plan, "confirm_all": True})
+        r1 = self._client.post("/api/execute", content=body, headers=_JSON_HEADERS)
+        r2 = self._client.post("/api/execute", content=body, headers=_JSON_HEADERS)
 
         self.assertTrue(r1.status_code != 200 or r2.status_code != 200)
 
-    def test_invalid_action_type(self) -> None:
-        client = TestClient(app)
-        response = client.post(
-            "/api/plans",
-            json={
-                "snapshot_id": "snap-1",
-                "exposures": [{"asset_code": "USD", "quantity": 1000}],
-                "intent": {
-                    "action_type": "NUKE",
-                    "from_asset": "USD",
-                    "to_asset": "EUR",
-                    "amount": 100,
-                },
-            },
-        )
-        self.assertEqual(response.status_code, 400)
-
-    def test_negative_amount(self) -> None:
-        client = TestClient(app)
-        response = client.post(
-            "/api/plans",
-            json={
-                "snapshot_id": "snap-1",
-                "exposures": [{"asset_code": "USD", "quantity": 1000}],
-                "intent": {
-                    "action_type": "TRANSFER",
-                    "from_asset": "USD",
-                    "to_asset": "EUR",
-                    "amount": -100,
-                },
-            },
-        )
-        self.assertEqual(response.status_code, 400)
+    def test_invalid_plan_intents(self) -> None:
+        for name, action_type, amount in _INVALID_INTENTS:
+            with self.subTest(name):
+                response = self._client.post(
+                    "/api/plans", json=_plan_body(action_type, "EUR", amount)
+                )
+                self.assertEqual(response.status_code, 400)
 
     def test_execute_without_simulation(self) -> None:
-        client = TestClient(app)
-        plan_response = client.post(
-            "/api/plans",
-            json={
-                "snapshot_id": "snap-1",
-                "exposures": [{"asset_code": "USD", "quantity": 1000}],
-                "intent": {
-                    "action_type": "HOLD",
-                    "from_asset": "USD",
-                    "to_asset": "USD",
-                    "amount": 0,
-                },
-            },
+        plan = self._create_hold_plan()
+        response = self._client.post(
+            "/api/execute", content=_execute_body(plan), headers=_JSON_HEADERS
         )
-        self.assertEqual(plan_response.status_code, 200)
-        plan = plan_response.json()
-
-        response = client.post("/api/execute", json={"plan": plan, "confirm_all": True})
         self.assertIn(response.status_code, (400, 403))
 
 